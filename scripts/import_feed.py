@@ -2,8 +2,9 @@ import sys
 import os
 import re
 import hashlib
+import threading
 import requests
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -12,11 +13,13 @@ root_dir = Path(__file__).resolve().parent.parent
 sys.path.append(str(root_dir))
 
 from src.paths import PROJECT_ROOT
-from src.r2_storage import R2Storage
 
 # Load configurations
 load_dotenv(PROJECT_ROOT / "config" / ".env")
 
+# Compiled once: these run per item when parsing the source feed.
+_ITEM_RE = re.compile(r'<item>.*?</item>', re.DOTALL)
+
 
 def download_file(url, dest_path):
     """Downloads a file from a URL to a local path."""
@@ -67,18 +70,16 @@ def migrate_feed(old_rss_url):
         return
 
     # 3. Parse items from the old RSS
-    items = re.findall(r'<item>.*?</item>', old_xml, re.DOTALL)
+    items = _ITEM_RE.findall(old_xml)
     print(f"Found {len(items)} episodes to migrate.")
 
     temp_dir = PROJECT_ROOT / "temp_migration"
     temp_dir.mkdir(exist_ok=True)
 
-    imported_count = 0
-
+    # Parse all items up front so the duplicate check can run as one
+    # batched query instead of one round-trip per episode.
+    episodes = []
     for item_xml in reversed(items):  # Process from oldest to newest
-        print("\nProcessing episode...")
-        
-        # Extract metadata
         title_match = re.search(r'<title>(.*?)</title>', item_xml, re.DOTALL)
         url_match = re.search(r'<enclosure.*?url="(.*?)"', item_xml)
         date_match = re.search(r'<pubDate>(.*?)</pubDate>', item_xml)
@@ -87,22 +88,39 @@ def migrate_feed(old_rss_url):
         thumb_match = re.search(r'<itunes:image.*?href="(.*?)"', item_xml)
 
         if not all([title_match, url_match]):
-            print("  ⚠️ Incomplete episode data. Skipping.")
+            print("⚠️ Incomplete episode data. Skipping.")
             continue
 
-        title = clean_cdata(title_match.group(1))
-        old_url = url_match.group(1).replace("&amp;", "&")
-        old_thumb_url = thumb_match.group(1).replace("&amp;", "&") if thumb_match else None
-        pub_date = date_match.group(1) if date_match else None
-        duration = duration_match.group(1) if duration_match else ""
-        description = extract_description(item_xml)
+        episodes.append({
+            "title": clean_cdata(title_match.group(1)),
+            "old_url": url_match.group(1).replace("&amp;", "&"),
+            "old_thumb_url": thumb_match.group(1).replace("&amp;", "&") if thumb_match else None,
+            "pub_date": date_match.group(1) if date_match else None,
+            "duration": duration_match.group(1) if duration_match else "",
+            "description": extract_description(item_xml),
+            "guid": guid_match.group(1) if guid_match else None,
+        })
+
+    existing_by_title = manager.get_episodes_by_titles([ep["title"] for ep in episodes])
+    existing_lock = threading.Lock()
+
+    def process_episode(ep):
+        """Migrates one episode end to end. Returns 1 if newly imported."""
+        print("\nProcessing episode...")
+        title = ep["title"]
+        old_url = ep["old_url"]
+        old_thumb_url = ep["old_thumb_url"]
+        pub_date = ep["pub_date"]
+        duration = ep["duration"]
+        description = ep["description"]
 
         desc_preview = (description[:50] + "...") if len(description) > 50 else description
         print(f"  Migrating: {title}")
         print(f"  Description: {desc_preview} ({len(description)} chars)")
 
         # --- Duplicate Check & Metadata Update ---
-        existing_episode = manager.get_episode_by_title(title)
+        with existing_lock:
+            existing_episode = existing_by_title.get(title)
         if existing_episode:
             print(f"  🔄 Episode already exists. Updating metadata (including pubDate: {pub_date})...")
             update_data = {
@@ -114,14 +132,14 @@ def migrate_feed(old_rss_url):
                 print(f"  ✅ Correctly updated: {title}")
             else:
                 print(f"  ❌ Failed to update metadata for: {title}")
-            continue
+            return 0
 
         # --- Naming Logic ---
         file_id_match = re.search(r'(?:id=|\/d\/)([a-zA-Z0-9_-]{20,})', old_url)
         if file_id_match:
             file_id = file_id_match.group(1)
-        elif guid_match:
-            file_id = re.sub(r'[^a-zA-Z0-9_-]', '_', guid_match.group(1))[:30]
+        elif ep["guid"]:
+            file_id = re.sub(r'[^a-zA-Z0-9_-]', '_', ep["guid"])[:30]
         else:
             file_id = hashlib.md5(title.encode()).hexdigest()[:10]
 
@@ -142,7 +160,8 @@ def migrate_feed(old_rss_url):
         if download_file(old_url, local_audio_path):
             print("  Uploading Audio to Cloudflare R2...")
             new_url = manager.upload_file(local_audio_path, content_type='audio/mpeg')
-            
+
+            imported = 0
             if new_url:
                 print("  ✅ Uploaded. Updating Supabase Database...")
                 episode_data = {
@@ -154,11 +173,38 @@ def migrate_feed(old_rss_url):
                     "image": new_thumb_url
                 }
                 manager.add_episode(episode_data)
-                imported_count += 1
-            
+                # Make the new row visible to later occurrences of the
+                # same title, which take the metadata-update path.
+                inserted = manager.get_episode_by_title(title)
+                if inserted:
+                    with existing_lock:
+                        existing_by_title[title] = inserted
+                imported = 1
+
             local_audio_path.unlink()
+            return imported
         else:
             print(f"  ❌ Skipping {title} due to download error.")
+            return 0
+
+    # Group same-title episodes so repeats run sequentially in feed
+    # order: the first occurrence inserts, later ones see it in the
+    # shared map and take the metadata-update path, exactly like the
+    # old per-episode query did.
+    by_title = {}
+    for ep in episodes:
+        by_title.setdefault(ep["title"], []).append(ep)
+
+    def process_title(eps):
+        return sum(process_episode(ep) for ep in eps)
+
+    # Pipeline the titles over a small worker pool: while one worker
+    # uploads to R2, others are downloading from the old host, so the
+    # stages (old CDN, R2, Supabase) overlap instead of running in
+    # lockstep. Episode order in the feed comes from pub_date, so
+    # concurrent inserts are safe.
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        imported_count = sum(executor.map(process_title, by_title.values()))
 
     print(f"\n✅ MIGRATION FINISHED! {imported_count} episodes processed.")
 
@@ -1,6 +1,8 @@
 import sys
 import os
+import re
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -20,30 +22,29 @@ load_dotenv(PROJECT_ROOT / "config" / ".env")
 
 # ── Helpers ──────────────────────────────────────────────
 
+# Matches MM:SS or HH:MM:SS in one pass
+_TIME_RE = re.compile(r"^(?:(\d+):)?(\d+):(\d+)$")
+
+
 def parse_time_to_seconds(time_str):
     """Parses time in seconds or MM:SS or HH:MM:SS format to seconds."""
-    try:
-        if ":" in time_str:
-            parts = time_str.split(":")
-            if len(parts) == 2:
-                return int(parts[0]) * 60 + int(parts[1])
-            elif len(parts) == 3:
-                return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-        return int(time_str)
-    except (ValueError, TypeError):
+    if time_str is None:
         return None
+    time_str = str(time_str).strip()
+    match = _TIME_RE.match(time_str)
+    if match:
+        h, m, s = match.groups()
+        return (int(h) if h else 0) * 3600 + int(m) * 60 + int(s)
+    return int(time_str) if time_str.isdigit() else None
 
 
 def format_seconds(seconds):
     """Formats seconds into MM:SS or HH:MM:SS."""
     if seconds is None:
         return "N/A"
-    h = int(seconds) // 3600
-    m = (int(seconds) % 3600) // 60
-    s = int(seconds) % 60
-    if h > 0:
-        return f"{h}:{m:02d}:{s:02d}"
-    return f"{m}:{s:02d}"
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
 
 
 def prompt_editable(label, current_value, multiline=False):
@@ -88,6 +89,7 @@ def main():
     parser = argparse.ArgumentParser(description="YouTube Preaching Cutter")
     parser.add_argument("url", help="YouTube URL of the church service")
     parser.add_argument("--no-upload", action="store_true", help="Only cut the video locally, do not upload to YouTube")
+    parser.add_argument("--full-download", action="store_true", help="Download the full video instead of only the detected sermon segment")
     parser.add_argument("--title", help="Title for the uploaded video")
     parser.add_argument("--desc", help="Description for the uploaded video")
     
@@ -103,14 +105,40 @@ def main():
 
     dl = Downloader()
 
-    # ── Step 2: Fetch Transcript ─────────────────────────
-    print("\n--- Step 2: Fetching transcript ---")
-    transcript = dl.get_transcript(video_id)
+    # ── Steps 2+3: Fetch Transcript (& download when --full-download) ──
+    # By default the video download waits until the sermon segment is
+    # known, so only that range is fetched. With --full-download the
+    # whole video downloads in parallel with the transcript fetch, and
+    # AI segment detection starts as soon as the transcript arrives.
+    seg = None
+    detection_future = None
+    video_future = None
+
+    def _fetch_and_detect():
+        transcript = dl.get_transcript(video_id)
+        if transcript:
+            nonlocal detection_future
+            try:
+                detection_future = executor.submit(seg.detect_preaching_segment, transcript)
+            except Exception as e:
+                print(f"  [⚠️] Could not start AI detection: {e}")
+        return transcript
+
+    try:
+        seg = Segmenter()
+    except Exception as e:
+        print(f"  [⚠️] Could not initialize Segmenter: {e}")
+
+    executor = ThreadPoolExecutor(max_workers=3)
 
-    # ── Step 3: Download Video (Maximum Quality) ──────────
-    print("\n--- Step 3: Downloading video (Maximum Quality) ---")
-    video_path, video_id = dl.download_video(args.url)
-    print(f"Video downloaded to: {video_path}")
+    if args.full_download:
+        print("\n--- Steps 2+3: Fetching transcript & downloading video (parallel) ---")
+        transcript_future = executor.submit(_fetch_and_detect if seg else dl.get_transcript, video_id)
+        video_future = executor.submit(dl.download_video, args.url)
+        transcript = transcript_future.result()
+    else:
+        print("\n--- Step 2: Fetching transcript ---")
+        transcript = _fetch_and_detect() if seg else dl.get_transcript(video_id)
 
     # ── Step 4: Detect Preaching Segment ─────────────────
     start_time, end_time = None, None
@@ -118,10 +146,12 @@ def main():
     if transcript:
         print("Transcript fetched successfully.")
         print("\n--- Step 4: Detecting preaching segment ---")
-        
+
         try:
-            seg = Segmenter()
-            start_time, end_time = seg.detect_preaching_segment(transcript)
+            if detection_future is not None:
+                start_time, end_time = detection_future.result()
+            elif seg:
+                start_time, end_time = seg.detect_preaching_segment(transcript)
         except Exception as e:
             print(f"  [⚠️] AI detection failed: {e}")
 
@@ -149,13 +179,19 @@ def main():
     duration = (end_time - start_time) / 60
     print(f"\n  ✅ Segment: {format_seconds(start_time)} → {format_seconds(end_time)} ({duration:.1f} min)")
 
+    # ── Download (sermon segment only) ───────────────────
+    # Kicked off in the background so it overlaps the metadata and
+    # thumbnail prompts below.
+    if video_future is None:
+        print(f"\n--- Downloading sermon segment ({format_seconds(start_time)} → {format_seconds(end_time)}) ---")
+        video_future = executor.submit(dl.download_video, args.url, (start_time, end_time))
+
     # ── Step 5: Generate / Edit Metadata ─────────────────
     print("\n--- Step 5: Metadata (Title, Description, Tags) ---")
 
     ai_metadata = None
-    if transcript:
+    if transcript and seg:
         try:
-            seg = seg if 'seg' in dir() else Segmenter()
             ai_metadata = seg.generate_metadata(transcript, start_time, end_time)
         except Exception as e:
             print(f"  [⚠️] AI metadata generation failed: {e}")
@@ -201,41 +237,79 @@ def main():
     if thumb_youtube and not custom_thumb_youtube:
         print(f"  ⚠️ YouTube Thumb not found: {thumb_youtube}")
 
-    # ── Step 6: Cut Video ────────────────────────────────
-    print("\n--- Step 6: Cutting video ---")
+    # ── Wait for the download to finish ──────────────────
+    video_path, video_id = video_future.result()
+    executor.shutdown()
+    print(f"\nVideo downloaded to: {video_path}")
+
+    # ── Steps 6+7: Cut Video & Extract MP3 (single pass) ─
+    # All user input is collected by now, so the cut runs in a background
+    # thread while the upload clients initialize (OAuth refresh etc.).
+    print("\n--- Steps 6+7: Cutting video & extracting MP3 for Spotify ---")
     cutter = Cutter()
     output_name = f"{video_id}.mp4"
-    cut_path = cutter.cut_video(video_path, start_time, end_time, output_name)
-    
+    mp3_name = f"{video_id}.mp3"
+
+    # Range downloads are already trimmed: the "cut" is a near-instant
+    # remux of the whole file.
+    if "_cut_" in Path(video_path).stem:
+        cut_start, cut_end = 0, end_time - start_time
+    else:
+        cut_start, cut_end = start_time, end_time
+
+    with ThreadPoolExecutor(max_workers=1) as cut_executor:
+        cut_future = cut_executor.submit(
+            cutter.cut_and_extract, video_path, cut_start, cut_end, output_name, mp3_name
+        )
+
+        manager = None
+        try:
+            from src.podcast_manager import PodcastManager
+            manager = PodcastManager()
+        except Exception as e:
+            print(f"  [⚠️] PodcastManager init failed: {e}")
+
+        up = None
+        if not args.no_upload:
+            try:
+                up = Uploader()
+            except Exception as e:
+                print(f"Error initializing YouTube uploader: {e}")
+                print("To fix upload, ensure 'client_secrets.json' is present.")
+
+        cut_path, mp3_path = cut_future.result()
+
     if not cut_path:
         print("Failed to cut video.")
         return
     print(f"Cut video path: {cut_path}")
 
-    # ── Step 7: Extract MP3 ──────────────────────────────
-    print("\n--- Step 7: Extracting MP3 for Spotify ---")
-    mp3_name = f"{video_id}.mp3"
-    mp3_path = cutter.extract_audio(cut_path, mp3_name)
     if mp3_path:
         print(f"MP3 path: {mp3_path}")
     else:
         print("Failed to extract MP3.")
 
     # ── Step 8: Upload to R2 + Supabase ──────────────────
-    if mp3_path:
+    if mp3_path and manager:
         print("\n--- Step 8: Uploading to R2 & Updating Supabase DB ---")
         try:
-            from src.podcast_manager import PodcastManager
-            manager = PodcastManager()
-            
-            r2_thumb_url = None
-            if custom_thumb_podcast:
-                print("Uploading Square Thumbnail to Cloudflare R2...")
-                ext = custom_thumb_podcast.split('.')[-1]
-                r2_thumb_url = manager.upload_file(custom_thumb_podcast, object_name=f"{video_id}.{ext}", content_type=f'image/{ext}')
-
-            print("Uploading MP3 to Cloudflare R2...")
-            episode_url = manager.upload_file(mp3_path, content_type='audio/mpeg')
+            # Thumbnail and MP3 uploads are independent PUTs; overlap them
+            # so wall-clock is max(thumb, mp3) instead of the sum.
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                thumb_future = None
+                if custom_thumb_podcast:
+                    print("Uploading Square Thumbnail to Cloudflare R2...")
+                    ext = custom_thumb_podcast.split('.')[-1]
+                    thumb_future = executor.submit(
+                        manager.upload_file, custom_thumb_podcast,
+                        object_name=f"{video_id}.{ext}", content_type=f'image/{ext}'
+                    )
+
+                print("Uploading MP3 to Cloudflare R2...")
+                mp3_future = executor.submit(manager.upload_file, mp3_path, content_type='audio/mpeg')
+
+                r2_thumb_url = thumb_future.result() if thumb_future else None
+                episode_url = mp3_future.result()
             
             if episode_url:
                 print(f"MP3 uploaded to R2: {episode_url}")
@@ -258,11 +332,9 @@ def main():
             print(f"Error during Hybrid Storage update: {e}")
 
     # ── Step 9: Upload to YouTube ────────────────────────
-    if not args.no_upload:
+    if not args.no_upload and up:
         print("\n--- Step 9: Uploading to YouTube (Unlisted) ---")
         try:
-            up = Uploader()
-            
             new_video_id = up.upload_video(
                 cut_path, 
                 metadata["title"], 
@@ -279,7 +351,7 @@ def main():
         except Exception as e:
             print(f"Error during upload: {e}")
             print("To fix upload, ensure 'client_secrets.json' is present.")
-    else:
+    elif args.no_upload:
         print("\nSkipping YouTube upload step as requested.")
 
 
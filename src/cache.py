@@ -0,0 +1,147 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from src.paths import PROJECT_ROOT
+
+# zstd shrinks transcript text roughly 4x; storage works without it,
+# new writes just stay uncompressed.
+try:
+    import zstandard
+    _ZSTD_COMPRESS = zstandard.ZstdCompressor(level=3).compress
+    _ZSTD_DECOMPRESS = zstandard.ZstdDecompressor().decompress
+except ImportError:
+    _ZSTD_COMPRESS = None
+    _ZSTD_DECOMPRESS = None
+
+# Every zstd frame starts with this magic, so a blob self-describes
+# whether it was written compressed.
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+class Cache:
+    """Simple SQLite-backed key/value cache for expensive pipeline results.
+
+    Used to memoize AI segment detection and metadata generation so that
+    re-running the pipeline on the same video is near-instant.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path) if db_path else PROJECT_ROOT / "cache" / "churchpod.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # The cache is built on the main thread but read and written from
+        # pool workers (detect_many, the pipeline's detection future), so
+        # share one connection behind a lock like TranscriptStore does.
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, ts INTEGER)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(*parts):
+        """Builds a stable SHA-256 key from arbitrary JSON-serializable parts."""
+        hasher = hashlib.sha256()
+        for part in parts:
+            if not isinstance(part, str):
+                part = json.dumps(part, sort_keys=True, ensure_ascii=False)
+            hasher.update(part.encode('utf-8'))
+            hasher.update(b'\x00')
+        return hasher.hexdigest()
+
+    def get(self, key):
+        """Returns the cached value for key, or None if missing."""
+        try:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT value FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            print(f"Cache read error: {e}")
+            return None
+
+    def put(self, key, value):
+        """Stores a JSON-serializable value under key."""
+        try:
+            with self._lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, ts) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), int(time.time())),
+                )
+                self.conn.commit()
+        except Exception as e:
+            print(f"Cache write error: {e}")
+
+    def get_or_compute(self, key, fn):
+        """Returns the cached value for key, computing and storing it if absent."""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        value = fn()
+        if value is not None:
+            self.put(key, value)
+        return value
+
+
+class TranscriptStore:
+    """SQLite-backed transcript storage with zstd-compressed payloads.
+
+    Replaces the per-video JSON sidecar files: one database instead of
+    hundreds of small files, compressed blobs instead of raw UTF-8, and
+    a single indexed lookup instead of a directory scan. Safe to share
+    across the downloader's worker threads.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path) if db_path else PROJECT_ROOT / "cache" / "transcripts.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS transcripts "
+            "(video_id TEXT PRIMARY KEY, data BLOB, ts INTEGER)"
+        )
+        self.conn.commit()
+
+    def get(self, video_id):
+        """Returns the stored transcript for video_id, or None if missing."""
+        try:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT data FROM transcripts WHERE video_id = ?", (video_id,)
+                ).fetchone()
+            if not row:
+                return None
+            blob = row[0]
+            if blob[:4] == _ZSTD_MAGIC:
+                if _ZSTD_DECOMPRESS is None:
+                    print("Transcript stored compressed but zstandard is not installed.")
+                    return None
+                blob = _ZSTD_DECOMPRESS(blob)
+            return json.loads(blob)
+        except Exception as e:
+            print(f"Transcript store read error: {e}")
+            return None
+
+    def put(self, video_id, transcript):
+        """Stores a transcript (list of dicts) under video_id."""
+        try:
+            blob = json.dumps(transcript, ensure_ascii=False,
+                              separators=(',', ':')).encode('utf-8')
+            if _ZSTD_COMPRESS is not None:
+                blob = _ZSTD_COMPRESS(blob)
+            with self._lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO transcripts (video_id, data, ts) VALUES (?, ?, ?)",
+                    (video_id, blob, int(time.time())),
+                )
+                self.conn.commit()
+        except Exception as e:
+            print(f"Transcript store write error: {e}")
@@ -1,74 +1,491 @@
-import ffmpeg
+import os
+import json
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from src.paths import PROJECT_ROOT
 
 
 class Cutter:
+    # Chunk length (seconds) for the parallel re-encode fallback
+    REENCODE_CHUNK_SECONDS = 120
+
+    # Pre-roll (seconds) for the coarse input seek; the precise output
+    # seek then trims the remainder so copy cuts land close to the
+    # requested start even off-keyframe.
+    SEEK_PREROLL_SECONDS = 2
+
+    # A copy cut whose duration is off by more than roughly one GOP is
+    # treated as failed and re-encoded.
+    COPY_DURATION_TOLERANCE = 5.0
+
+    # Hardware H.264 encoders in preference order; the first one present
+    # in this ffmpeg build is used for re-encode fallbacks.
+    HW_ENCODERS = ('h264_videotoolbox', 'h264_nvenc', 'h264_qsv')
+
     def __init__(self, output_dir=None):
         self.output_dir = Path(output_dir) if output_dir else PROJECT_ROOT / "cuts"
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._hwenc = None
+        self._hwenc_checked = False
+
+    def _select_hwenc(self):
+        """Returns the first available hardware H.264 encoder, or None.
+
+        Probed once per instance via 'ffmpeg -encoders'; hardware encode
+        moves the fallback off the CPU entirely.
+        """
+        if not self._hwenc_checked:
+            self._hwenc_checked = True
+            try:
+                out = subprocess.check_output(
+                    ['ffmpeg', '-hide_banner', '-encoders'],
+                    stderr=subprocess.DEVNULL,
+                ).decode(errors='replace')
+                for enc in self.HW_ENCODERS:
+                    if enc in out:
+                        self._hwenc = enc
+                        print(f"  [⚡] Hardware encoder available: {enc}")
+                        break
+            except Exception:
+                pass
+        return self._hwenc
+
+    # ── Helpers ──────────────────────────────────────────────
+
+    @staticmethod
+    def _nonempty(path):
+        """True if path exists and is non-empty, in a single stat call."""
+        try:
+            return path.stat().st_size > 0
+        except OSError:
+            return False
+
+    @staticmethod
+    def _run_ffmpeg(args, cpu=None):
+        """Runs ffmpeg with the given arguments. Returns (ok, stderr_text).
+
+        stdout goes to /dev/null and only errors are logged, so long
+        encodes don't buffer megabytes of progress output in memory.
+        When ``cpu`` is given and the platform supports it (Linux), the
+        process is pinned to that core so parallel encoders don't get
+        migrated and lose cache locality.
+        """
+        cmd = ['ffmpeg', '-nostdin', '-hide_banner', '-nostats', '-loglevel', 'error', '-y', *args]
+        preexec = None
+        if cpu is not None and hasattr(os, 'sched_setaffinity'):
+            core = cpu % (os.cpu_count() or 1)
+            preexec = lambda: os.sched_setaffinity(0, {core})
+        proc = subprocess.run(cmd, stdin=subprocess.DEVNULL,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                              preexec_fn=preexec)
+        stderr = proc.stderr.decode(errors='replace') if proc.stderr else ''
+        return proc.returncode == 0, stderr
+
+    @staticmethod
+    def _probe_duration(video_path):
+        """Returns the container duration in seconds, or None on failure."""
+        try:
+            cmd = [
+                'ffprobe', '-v', 'error',
+                '-show_entries', 'format=duration', '-of', 'json', str(video_path)
+            ]
+            probe = subprocess.check_output(cmd, stderr=subprocess.DEVNULL).decode('utf-8')
+            duration = json.loads(probe).get('format', {}).get('duration')
+            return float(duration) if duration is not None else None
+        except (subprocess.CalledProcessError, json.JSONDecodeError, ValueError):
+            return None
+
+    @staticmethod
+    def _probe_bit_rate(video_path):
+        """Returns the container bit rate in bits/s, or None on failure."""
+        try:
+            cmd = [
+                'ffprobe', '-v', 'error',
+                '-show_entries', 'format=bit_rate', '-of', 'json', str(video_path)
+            ]
+            probe = subprocess.check_output(cmd, stderr=subprocess.DEVNULL).decode('utf-8')
+            bit_rate = json.loads(probe).get('format', {}).get('bit_rate')
+            return int(bit_rate) if bit_rate is not None else None
+        except (subprocess.CalledProcessError, json.JSONDecodeError, ValueError):
+            return None
+
+    def _check_output_space(self, input_path, duration):
+        """Warns when the output dir lacks room for the estimated cut size.
+
+        ffmpeg truncates its output on open, so preallocating the file up
+        front buys nothing; what does hurt is running out of disk halfway
+        through a multi-GB write. Estimate size as bitrate x duration and
+        fail fast instead. Returns False only when space is clearly short.
+        """
+        bit_rate = self._probe_bit_rate(input_path)
+        if not bit_rate:
+            return True
+        estimated = int(bit_rate * duration / 8 * 1.1)
+        try:
+            free = shutil.disk_usage(self.output_dir).free
+        except OSError:
+            return True
+        if free < estimated:
+            print(
+                f"Not enough disk space for cut: need ~{estimated // (1024*1024)} MB, "
+                f"only {free // (1024*1024)} MB free in {self.output_dir}."
+            )
+            return False
+        return True
+
+    @staticmethod
+    def _probe_audio_codec(video_path):
+        """Returns the codec name of the first audio stream, or None on failure."""
+        try:
+            cmd = [
+                'ffprobe', '-v', 'error', '-select_streams', 'a:0',
+                '-show_entries', 'stream=codec_name', '-of', 'json', str(video_path)
+            ]
+            probe = subprocess.check_output(cmd, stderr=subprocess.DEVNULL).decode('utf-8')
+            streams = json.loads(probe).get('streams', [])
+            if streams:
+                return streams[0].get('codec_name')
+        except (subprocess.CalledProcessError, json.JSONDecodeError):
+            pass
+        return None
+
+    # ── Core Methods ─────────────────────────────────────────
 
     def cut_video(self, input_path, start_time, end_time, output_name, skip_existing=True):
         """Cuts the video using ffmpeg. Uses '-c copy' for speed, falls back to re-encode."""
         output_path = self.output_dir / output_name
-        
-        if skip_existing and output_path.exists() and output_path.stat().st_size > 0:
+
+        if skip_existing and self._nonempty(output_path):
             print(f"Cut video {output_name} already exists. Skipping cut.")
             return str(output_path)
 
-        if output_path.exists():
-            output_path.unlink()
+        output_path.unlink(missing_ok=True)
 
-        try:
-            (
-                ffmpeg
-                .input(input_path, ss=start_time, to=end_time)
-                .output(str(output_path), c='copy')
-                .run(overwrite_output=True, capture_stdout=True, capture_stderr=True)
-            )
-            return str(output_path)
-        except ffmpeg.Error as e:
-            stderr_msg = e.stderr.decode() if e.stderr else str(e)
-            print(f"FFmpeg copy error: {stderr_msg}")
-            
-            # Fallback: re-encode if copy fails
-            print("Attempting fallback with re-encoding...")
-            try:
-                (
-                    ffmpeg
-                    .input(input_path, ss=start_time, to=end_time)
-                    .output(str(output_path))
-                    .run(overwrite_output=True, capture_stdout=True, capture_stderr=True)
-                )
+        duration = end_time - start_time
+
+        if not self._check_output_space(input_path, duration):
+            return None
+
+        # Two-stage seek: a coarse input '-ss' (fast, keyframe-snapped)
+        # slightly before the target, then a precise output '-ss' for the
+        # remainder, so copy cuts stay accurate off-keyframe too.
+        coarse = max(0, start_time - self.SEEK_PREROLL_SECONDS)
+        ok, stderr = self._run_ffmpeg([
+            '-ss', str(coarse), '-i', str(input_path),
+            '-ss', str(start_time - coarse),
+            '-t', str(duration),
+            '-map', '0', '-c', 'copy',
+            '-avoid_negative_ts', 'make_zero',
+            '-movflags', '+faststart',
+            str(output_path),
+        ])
+        if ok:
+            # Verify the copy actually honored the window; a duration off
+            # by more than ~one GOP means keyframes didn't line up.
+            actual = self._probe_duration(output_path)
+            if actual is None or abs(actual - duration) <= self.COPY_DURATION_TOLERANCE:
                 return str(output_path)
-            except ffmpeg.Error as e2:
-                stderr_msg = e2.stderr.decode() if e2.stderr else str(e2)
-                print(f"Fallback FFmpeg error: {stderr_msg}")
+            print(f"Copy cut duration off by {abs(actual - duration):.1f}s. Re-encoding...")
+            output_path.unlink(missing_ok=True)
+        else:
+            print(f"FFmpeg copy error: {stderr}")
+
+        # Fallback: re-encode in parallel chunks if copy fails
+        print("Attempting fallback with parallel re-encoding...")
+        return self._parallel_reencode(input_path, start_time, end_time, output_path)
+
+    def cut_many(self, input_path, cuts, skip_existing=True):
+        """Cuts several segments from one source file concurrently.
+
+        cuts is a list of (start_time, end_time, output_name) tuples.
+        Stream-copy cuts are I/O-bound, so running the ffmpeg processes
+        in parallel is almost free on SSDs. Returns output paths (None
+        for failures) in input order.
+        """
+        if not cuts:
+            return []
+
+        workers = min(len(cuts), 8, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                lambda cut: self.cut_video(
+                    input_path, cut[0], cut[1], cut[2], skip_existing=skip_existing
+                ),
+                cuts,
+            ))
+
+    def cut_many_single_pass(self, input_path, cuts, skip_existing=True):
+        """Cuts several segments with a single ffmpeg invocation.
+
+        The input is opened and demuxed exactly once, with one mapped
+        stream-copy output per cut — cheapest when cuts are short and the
+        per-process startup/parse cost dominates. For a few long cuts in
+        a large file, cut_many's parallel input-seeking processes win.
+        Returns output paths in input order, or None on failure.
+        """
+        if not cuts:
+            return []
+
+        paths = [self.output_dir / name for _, _, name in cuts]
+        if skip_existing and all(self._nonempty(p) for p in paths):
+            print("All cut outputs already exist. Skipping batch cut.")
+            return [str(p) for p in paths]
+
+        args = ['-i', str(input_path)]
+        for (start, end, _), out in zip(cuts, paths):
+            out.unlink(missing_ok=True)
+            args += [
+                '-ss', str(start), '-to', str(end),
+                '-map', '0', '-c', 'copy',
+                '-avoid_negative_ts', 'make_zero',
+                '-movflags', '+faststart',
+                str(out),
+            ]
+
+        ok, stderr = self._run_ffmpeg(args)
+        if not ok:
+            print(f"FFmpeg batch cut error: {stderr}")
+            return None
+        return [str(p) for p in paths]
+
+    def _encode_chunk(self, input_path, start, end, part_path, cpu=None):
+        """Re-encodes one [start, end] slice of the source to an MPEG-TS part."""
+        hwenc = self._select_hwenc()
+        if hwenc:
+            video_args = ['-c:v', hwenc, '-b:v', '4M']
+            cpu = None  # hardware sessions don't benefit from pinning
+        else:
+            video_args = ['-c:v', 'libx264', '-preset', 'fast']
+
+        ok, stderr = self._run_ffmpeg([
+            '-ss', str(start), '-i', str(input_path),
+            '-t', str(end - start),
+            *video_args, '-c:a', 'aac',
+            '-f', 'mpegts',
+            str(part_path),
+        ], cpu=cpu)
+        if not ok:
+            print(f"FFmpeg chunk encode error ({start}-{end}): {stderr}")
+        return ok
+
+    def _parallel_reencode(self, input_path, start_time, end_time, output_path):
+        """Full re-encode fallback, split into chunks encoded concurrently.
+
+        Each chunk runs in its own ffmpeg process (one per core), then the
+        MPEG-TS parts are joined losslessly with the concat demuxer.
+        """
+        parts_dir = self.output_dir / f"{output_path.stem}_parts"
+        parts_dir.mkdir(exist_ok=True)
+
+        chunk = self.REENCODE_CHUNK_SECONDS
+        bounds = []
+        s = start_time
+        while s < end_time:
+            bounds.append((s, min(s + chunk, end_time)))
+            s += chunk
+
+        part_paths = [parts_dir / f"part_{i:04d}.ts" for i in range(len(bounds))]
+        # Hardware encoders allow only a few concurrent sessions
+        max_workers = 2 if self._select_hwenc() else (os.cpu_count() or 1)
+        workers = min(len(bounds), max_workers)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    lambda args: self._encode_chunk(
+                        input_path, args[1][0], args[1][1], args[2], cpu=args[0]),
+                    zip(range(len(bounds)), bounds, part_paths),
+                ))
+
+            if not all(results):
+                print("One or more chunks failed to encode.")
                 return None
 
-    def extract_audio(self, video_path, output_name, skip_existing=True):
-        """Extracts audio from video and saves as MP3."""
-        output_path = self.output_dir / output_name
-        
-        if skip_existing and output_path.exists() and output_path.stat().st_size > 0:
-            print(f"MP3 {output_name} already exists. Skipping extraction.")
+            concat_list = parts_dir / "concat.txt"
+            with open(concat_list, 'w', encoding='utf-8') as f:
+                for part in part_paths:
+                    f.write(f"file '{part.name}'\n")
+
+            ok, stderr = self._run_ffmpeg([
+                '-f', 'concat', '-safe', '0', '-i', str(concat_list),
+                '-c', 'copy', '-movflags', '+faststart',
+                str(output_path),
+            ])
+            if not ok:
+                print(f"FFmpeg concat error: {stderr}")
+                return None
             return str(output_path)
+        finally:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+
+    def cut_and_extract(self, input_path, start_time, end_time, mp4_name, mp3_name, skip_existing=True):
+        """Cuts the video and extracts the MP3 in a single ffmpeg pass.
+
+        Reads the source once and writes both outputs, instead of cutting
+        to MP4 and then re-reading the cut file for audio extraction.
+        Returns (mp4_path, mp3_path); either may be None on failure.
+        """
+        mp4_path = self.output_dir / mp4_name
+        mp3_path = self.output_dir / mp3_name
+
+        if (skip_existing
+                and self._nonempty(mp4_path)
+                and self._nonempty(mp3_path)):
+            print(f"Cut video {mp4_name} and MP3 {mp3_name} already exist. Skipping.")
+            return str(mp4_path), str(mp3_path)
+
+        for path in (mp4_path, mp3_path):
+            path.unlink(missing_ok=True)
+
+        duration = end_time - start_time
+
+        if not self._check_output_space(input_path, duration):
+            return None, None
+
+        # Same two-stage seek as cut_video, so the fused pass stays on
+        # the single-read path as often as the standalone cut does.
+        coarse = max(0, start_time - self.SEEK_PREROLL_SECONDS)
+        precise = start_time - coarse
+
+        ok, stderr = self._run_ffmpeg([
+            '-ss', str(coarse), '-i', str(input_path),
+            # Output 1: trimmed MP4, pure stream copy
+            '-ss', str(precise),
+            '-t', str(duration),
+            '-map', '0', '-c', 'copy',
+            '-avoid_negative_ts', 'make_zero',
+            '-movflags', '+faststart',
+            str(mp4_path),
+            # Output 2: VBR MP3 from the same demuxed stream
+            '-ss', str(precise),
+            '-t', str(duration),
+            '-vn', '-acodec', 'libmp3lame', '-q:a', '2',
+            str(mp3_path),
+        ])
+        if ok:
+            return str(mp4_path), str(mp3_path)
+
+        print(f"FFmpeg fused cut+extract error: {stderr}")
 
-        if output_path.exists():
-            output_path.unlink()
+        # Fallback: run the two stages separately
+        print("Falling back to separate cut and extraction...")
+        cut_path = self.cut_video(input_path, start_time, end_time, mp4_name, skip_existing=False)
+        if not cut_path:
+            return None, None
+        audio_path = self.extract_audio(cut_path, mp3_name, skip_existing=False)
+        return cut_path, audio_path
+
+    def cut_and_extract_piped(self, input_path, start_time, end_time, mp4_name, mp3_name):
+        """Cut + MP3 extraction as two processes joined by a named pipe.
+
+        Alternative to cut_and_extract for when the stages must be separate
+        processes (e.g. the MP4 upload should start while the MP3 is still
+        encoding). The cutter writes the trimmed stream to the disk MP4 and
+        to a FIFO via the tee muxer; the MP3 encoder consumes the FIFO, so
+        the cut file is never read back from disk. POSIX only.
+        """
+        if not hasattr(os, 'mkfifo'):
+            print("Named pipes unavailable on this platform. Using fused cut instead.")
+            return self.cut_and_extract(input_path, start_time, end_time, mp4_name, mp3_name)
+
+        mp4_path = self.output_dir / mp4_name
+        mp3_path = self.output_dir / mp3_name
+        fifo_path = self.output_dir / f".{mp4_path.stem}.fifo"
+        duration = end_time - start_time
+
+        fifo_path.unlink(missing_ok=True)
+        os.mkfifo(fifo_path)
 
         try:
-            (
-                ffmpeg
-                .input(video_path)
-                .output(str(output_path), vn=None, acodec='libmp3lame', ab='192k')
-                .run(overwrite_output=True, capture_stdout=True, capture_stderr=True)
+            # The FIFO copy needs fragmented MP4 so the consumer can read
+            # before the file is finalized.
+            tee_spec = (
+                f"[f=mp4:movflags=+faststart]{mp4_path}|"
+                f"[f=mp4:movflags=frag_keyframe+empty_moov]{fifo_path}"
+            )
+            producer = subprocess.Popen(
+                ['ffmpeg', '-hide_banner', '-nostats', '-loglevel', 'error', '-y',
+                 '-ss', str(start_time), '-i', str(input_path),
+                 '-t', str(duration), '-map', '0', '-c', 'copy',
+                 '-f', 'tee', tee_spec],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            )
+            consumer = subprocess.Popen(
+                ['ffmpeg', '-hide_banner', '-nostats', '-loglevel', 'error', '-y',
+                 '-i', str(fifo_path),
+                 '-vn', '-acodec', 'libmp3lame', '-ab', '192k',
+                 str(mp3_path)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
             )
+
+            _, producer_err = producer.communicate()
+
+            if producer.returncode != 0:
+                # If the producer died before opening the FIFO's write end
+                # (bad input, tee-spec error), the consumer is still blocked
+                # in open(2) on the FIFO and would never exit on its own.
+                consumer.kill()
+                consumer.communicate()
+                print(f"FFmpeg piped cut error: {producer_err.decode(errors='replace')}")
+                return None, None
+
+            _, consumer_err = consumer.communicate()
+            if consumer.returncode != 0:
+                print(f"FFmpeg piped MP3 error: {consumer_err.decode(errors='replace')}")
+                return str(mp4_path), None
+
+            return str(mp4_path), str(mp3_path)
+        finally:
+            fifo_path.unlink(missing_ok=True)
+
+    def extract_audio(self, video_path, output_name, skip_existing=True, prefer_copy=False, codec='mp3'):
+        """Extracts the audio track from a video.
+
+        codec='mp3' (default) encodes VBR MP3 (~190 kbps, faster than the
+        old CBR 192k); codec='opus' encodes Opus at 96k — about twice as
+        fast as LAME and half the file size, for targets that accept it.
+        With prefer_copy=True and an AAC source track, the stream is
+        copied into an .m4a instead — no decode/encode pass at all.
+        """
+        output_path = self.output_dir / output_name
+
+        copy_codec = False
+        if prefer_copy:
+            source_codec = self._probe_audio_codec(video_path)
+            if source_codec == 'aac':
+                output_path = output_path.with_suffix('.m4a')
+                copy_codec = True
+            elif source_codec == 'mp3':
+                output_path = output_path.with_suffix('.mp3')
+                copy_codec = True
+        if not copy_codec and codec == 'opus':
+            output_path = output_path.with_suffix('.opus')
+
+        if skip_existing and self._nonempty(output_path):
+            print(f"Audio {output_path.name} already exists. Skipping extraction.")
             return str(output_path)
-        except ffmpeg.Error as e:
-            stderr_msg = e.stderr.decode() if e.stderr else str(e)
-            print(f"FFmpeg audio extraction error: {stderr_msg}")
-            return None
+
+        output_path.unlink(missing_ok=True)
+
+        if copy_codec:
+            audio_args = ['-acodec', 'copy']
+        elif codec == 'opus':
+            audio_args = ['-acodec', 'libopus', '-ab', '96k', '-ar', '48000']
+        else:
+            audio_args = ['-acodec', 'libmp3lame', '-q:a', '2']
+
+        ok, stderr = self._run_ffmpeg([
+            '-i', str(video_path),
+            '-vn', *audio_args,
+            str(output_path),
+        ])
+        if ok:
+            return str(output_path)
+
+        print(f"FFmpeg audio extraction error: {stderr}")
+        return None
 
 
 if __name__ == "__main__":
@@ -1,78 +1,306 @@
 import os
 import re
 import json
-import glob
+import time
+import random
 import shutil
 import subprocess
+import threading
 import yt_dlp
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from src.paths import PROJECT_ROOT
+from src.cache import TranscriptStore
+from functools import lru_cache
 from youtube_transcript_api import YouTubeTranscriptApi
 
+# Compiled once at import so hot loops (e.g. batch mode) don't pay
+# per-call regex compilation. One pattern covers watch?v=, youtu.be/,
+# shorts/, embed/ etc., since all place the ID after 'v=' or '/'.
+_YT_ID_RE = re.compile(r"(?:v=|\/)([0-9A-Za-z_-]{11})")
+_YT_BARE_ID_RE = re.compile(r"[0-9A-Za-z_-]{11}")
+
+# VTT parsing patterns, shared by the cue loop below.
+_VTT_TAG_RE = re.compile(r'<[^>]+>')
+_VTT_TS_RE = re.compile(r'(?:(\d+):)?(\d+):(\d+)[.,](\d+)')
+# One cue: "start --> end<settings>\n<payload up to blank line or EOF>"
+_VTT_CUE_RE = re.compile(
+    r'(\d[\d:.,]*)\s*-->\s*(\d[\d:.,]*)[^\n]*\n(.*?)(?=\n\n|\Z)', re.S
+)
+
+# orjson serializes/parses the large transcript payloads several times
+# faster than stdlib json; fall back transparently when it's missing.
+try:
+    import orjson
+
+    # Compact output: transcripts are machine-consumed, so indentation
+    # only inflates write bandwidth and file size.
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(data):
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    _json_loads = json.loads
+
 
 class Downloader:
     """Handles video downloading and transcript fetching for YouTube videos."""
 
     SUPPORTED_EXTENSIONS = ['mp4', 'mkv', 'webm']
 
-    def __init__(self, output_dir=None):
+    # Retry policy for transcript fetches (YouTube 429s are common)
+    TRANSCRIPT_RETRIES = 4
+
+    # How long a cached info.json stays usable; YouTube format URLs
+    # expire after a few hours, so keep this comfortably shorter.
+    INFO_CACHE_TTL = 3600
+
+    # Browser cookies are re-exported daily; decrypting the Chrome
+    # cookie store on every run is slow (and may prompt the keychain).
+    COOKIE_CACHE_TTL = 24 * 3600
+
+    # One export at a time process-wide: the transcript session and the
+    # download options can both trigger it concurrently at startup.
+    _cookie_export_lock = threading.Lock()
+
+    def __init__(self, output_dir=None, concurrent_fragments=None):
         self.output_dir = Path(output_dir) if output_dir else PROJECT_ROOT / "downloads"
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        # Parallel fragment streams sidestep YouTube's per-stream
+        # throttling on DASH/HLS formats.
+        self.concurrent_fragments = concurrent_fragments or int(
+            os.environ.get('YTDLP_CONCURRENT_FRAGMENTS', 8)
+        )
+        self._session = None
+        self._transcript_api = None
+        self._index = None
+        self._base_opts = None
+        # Resolution strings keyed by video id or file path; filled from
+        # the yt-dlp info dict so the common path never spawns ffprobe.
+        self._res_cache = {}
+        self._transcript_store = None
+
+    def _get_transcript_store(self):
+        """Returns the shared SQLite transcript store, created lazily."""
+        if self._transcript_store is None:
+            self._transcript_store = TranscriptStore()
+        return self._transcript_store
+
+    def _get_transcript_api(self):
+        """Returns a shared YouTubeTranscriptApi bound to the pooled session."""
+        if self._transcript_api is None:
+            self._transcript_api = YouTubeTranscriptApi(http_client=self._get_http_session())
+        return self._transcript_api
+
+    def _export_browser_cookies(self):
+        """Exports Chrome's YouTube cookies to a shared Netscape file.
+
+        The export is reused (until COOKIE_CACHE_TTL) by both yt-dlp and
+        the transcript session, so the browser cookie store is decrypted
+        once per day instead of once per call site. Returns the file
+        path, or None when the browser cookies are unavailable.
+        """
+        cookie_path = PROJECT_ROOT / "cache" / "cookies.txt"
+
+        def _fresh():
+            try:
+                return time.time() - cookie_path.stat().st_mtime <= self.COOKIE_CACHE_TTL
+            except OSError:
+                return False
+
+        if _fresh():
+            return cookie_path
+
+        with self._cookie_export_lock:
+            # Another thread may have finished the export while we waited.
+            if _fresh():
+                return cookie_path
+
+            try:
+                import browser_cookie3
+                from http.cookiejar import MozillaCookieJar
+
+                cj = browser_cookie3.chrome(domain_name='.youtube.com')
+                cookie_path.parent.mkdir(parents=True, exist_ok=True)
+                # Write to a temp file and rename so readers (yt-dlp mid
+                # download) never see a truncated or half-written file.
+                tmp_path = cookie_path.with_name(f".tmp_{os.getpid()}_cookies.txt")
+                mcj = MozillaCookieJar(str(tmp_path))
+                for cookie in cj:
+                    mcj.set_cookie(cookie)
+                mcj.save(ignore_discard=True, ignore_expires=True)
+                os.replace(tmp_path, cookie_path)
+                print(f"  [🍪] Exported Chrome cookies to {cookie_path}.")
+                return cookie_path
+            except Exception as e:
+                print(f"  [⚠️] Could not export Chrome cookies: {e}")
+                return None
+
+    def _get_http_session(self):
+        """Returns a shared requests.Session with connection pooling and Chrome cookies.
+
+        Created once and reused across transcript fetches, so batch runs
+        don't open a fresh TLS connection per call.
+        """
+        if self._session is not None:
+            return self._session
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        cookie_file = self._export_browser_cookies()
+        if cookie_file:
+            from http.cookiejar import MozillaCookieJar
+            try:
+                cj = MozillaCookieJar(str(cookie_file))
+                cj.load(ignore_discard=True, ignore_expires=True)
+                session.cookies = cj
+                print("  [🍪] Loaded cached Chrome cookies for transcript fetch.")
+            except Exception as e:
+                print(f"  [⚠️] Could not load cached cookies: {e}")
+
+        self._session = session
+        return session
 
     # ── Helpers ──────────────────────────────────────────────
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def extract_video_id(url):
         """Extract YouTube video ID from URL without making network requests."""
-        patterns = [
-            r"(?:v=|\/)([0-9A-Za-z_-]{11}).*",
-            r"be\/([0-9A-Za-z_-]{11}).*",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        return None
-
-    def _find_existing_video(self, video_id):
+        # Fast path: the argument is already a bare 11-char ID
+        if len(url) == 11 and _YT_BARE_ID_RE.fullmatch(url):
+            return url
+        # Fast path: ordinary watch?v= URLs skip the general regex walk
+        if 'v=' in url:
+            cand = url.partition('v=')[2][:11]
+            if len(cand) == 11 and _YT_BARE_ID_RE.fullmatch(cand):
+                return cand
+        match = _YT_ID_RE.search(url)
+        return match.group(1) if match else None
+
+    def _dir_index(self):
+        """Name → size map of output_dir, built lazily in one scandir pass.
+
+        Existence checks become hash lookups instead of per-file stat
+        syscalls, which matters when sweeping a playlist of hundreds of
+        videos. Invalidated after anything writes to the directory.
+        """
+        if self._index is None:
+            index = {}
+            with os.scandir(self.output_dir) as entries:
+                for entry in entries:
+                    try:
+                        index[entry.name] = entry.stat().st_size
+                    except OSError:
+                        pass
+            self._index = index
+        return self._index
+
+    def _invalidate_index(self):
+        self._index = None
+
+    def _find_existing_video(self, video_id, suffix=""):
         """Check if a video file already exists for the given ID. Returns path or None."""
+        index = self._dir_index()
         for ext in self.SUPPORTED_EXTENSIONS:
-            video_path = self.output_dir / f"{video_id}.{ext}"
-            if video_path.exists():
-                return video_path
+            name = f"{video_id}{suffix}.{ext}"
+            if name in index:
+                return self.output_dir / name
         return None
 
     @staticmethod
-    def _get_video_resolution(video_path):
-        """Get resolution string (e.g. '1920x1080') via ffprobe. Returns empty string on failure."""
+    def _range_suffix(ranges):
+        """Filename suffix for a partial (range-limited) download."""
+        start, end = ranges
+        return f"_cut_{int(start)}_{int(end)}"
+
+    def _get_video_resolution(self, video_path, video_id=None):
+        """Get resolution string (e.g. '1920x1080'). Returns empty string on failure.
+
+        Consults the in-memory cache first (populated from yt-dlp info
+        dicts); ffprobe is only spawned for files we know nothing about,
+        and its answer is cached for the rest of the run.
+        """
+        cached = self._res_cache.get(video_id) or self._res_cache.get(str(video_path))
+        if cached is not None:
+            return cached
+        res = self._probe_resolution(video_path)
+        self._res_cache[str(video_path)] = res
+        return res
+
+    def _cache_resolution_from_info(self, info):
+        """Remembers width x height from an info dict for later lookups."""
+        width, height = info.get('width'), info.get('height')
+        video_id = info.get('id')
+        if width and height and video_id:
+            self._res_cache[video_id] = f"{width}x{height}"
+
+    @staticmethod
+    def _probe_resolution(video_path):
+        """Reads the first video stream's resolution from the container header.
+
+        Prefers PyAV, which parses the header in-process; falls back to
+        spawning ffprobe when PyAV is missing or can't open the file.
+        """
+        try:
+            import av
+            with av.open(str(video_path)) as container:
+                stream = container.streams.video[0]
+                return f"{stream.codec_context.width}x{stream.codec_context.height}"
+        except ImportError:
+            pass
+        except Exception:
+            # Unreadable via PyAV; let ffprobe have a try.
+            pass
+
         try:
             cmd = [
                 'ffprobe', '-v', 'error', '-select_streams', 'v:0',
                 '-show_entries', 'stream=width,height', '-of', 'json', str(video_path)
             ]
-            probe = subprocess.check_output(cmd, stderr=subprocess.DEVNULL).decode('utf-8')
-            probe_data = json.loads(probe)
+            probe = subprocess.check_output(cmd, stderr=subprocess.DEVNULL)
+            probe_data = _json_loads(probe)
             streams = probe_data.get('streams', [])
             if streams:
                 w = streams[0].get('width')
                 h = streams[0].get('height')
                 if w and h:
                     return f"{w}x{h}"
-        except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError):
+        except (subprocess.CalledProcessError, ValueError, KeyError):
             pass
         return ""
 
     def _build_base_opts(self):
-        """Build the base yt-dlp options dict with cookie and JS runtime configuration."""
-        # Cookie strategy: manual file > Chrome browser
+        """Build the base yt-dlp options dict with cookie and JS runtime configuration.
+
+        Built once per instance: the cookie probing and Node.js runtime
+        lookup aren't free, and fully cached runs (video + transcript on
+        disk) shouldn't pay for them at all, so callers only invoke this
+        right before actually talking to YouTube.
+        """
+        if self._base_opts is not None:
+            return self._base_opts
+
+        # Cookie strategy: manual file > cached browser export > Chrome browser
         manual_cookies = PROJECT_ROOT / "cookies.txt"
         cookie_opts = {}
         if manual_cookies.exists():
             print("  [🔓] Using manual cookies.txt for authentication.")
             cookie_opts['cookiefile'] = str(manual_cookies)
         else:
-            print("  [🍪] Using Chrome cookies for authentication.")
-            cookie_opts['cookiesfrombrowser'] = ('chrome',)
+            cached_cookies = self._export_browser_cookies()
+            if cached_cookies:
+                cookie_opts['cookiefile'] = str(cached_cookies)
+            else:
+                print("  [🍪] Using Chrome cookies for authentication.")
+                cookie_opts['cookiesfrombrowser'] = ('chrome',)
 
         # Node.js runtime for YouTube JS challenge solving
         node_path = shutil.which('node')
@@ -84,11 +312,13 @@ class Downloader:
         else:
             print("  [⚠️] Node.js not found! 1080p may not be available.")
 
-        return {
+        self._base_opts = {
             'nocheckcertificate': True,
             'ignoreerrors': True,
             'quiet': True,
             'no_warnings': True,
+            'concurrent_fragment_downloads': self.concurrent_fragments,
+            'http_chunk_size': 10485760,
             'remote_components': ['ejs:github'],
             'http_headers': {
                 'User-Agent': (
@@ -105,6 +335,29 @@ class Downloader:
             **cookie_opts,
             **js_opts,
         }
+        return self._base_opts
+
+    def _load_cached_info(self, video_id):
+        """Returns a recent cached info dict for video_id, or None."""
+        info_path = self.output_dir / f"{video_id}.info.json"
+        try:
+            if time.time() - info_path.stat().st_mtime <= self.INFO_CACHE_TTL:
+                return _json_loads(info_path.read_bytes())
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _save_info_cache(self, info):
+        """Persists a sanitized info dict next to the video for reuse."""
+        video_id = info.get('id')
+        if not video_id:
+            return
+        info_path = self.output_dir / f"{video_id}.info.json"
+        try:
+            with open(info_path, 'wb') as f:
+                f.write(_json_dumps(info))
+        except Exception as e:
+            print(f"Warning: could not cache video info: {e}")
 
     @staticmethod
     def _clear_ytdlp_cache():
@@ -117,66 +370,124 @@ class Downloader:
 
     # ── Core Methods ─────────────────────────────────────────
 
-    def download_video(self, url):
-        """Downloads the video in the best available format (up to 1080p).
+    def download_video(self, url, ranges=None, max_resolution=1080):
+        """Downloads the video in the best available format (up to max_resolution).
+
+        With ranges=(start, end) in seconds, only that portion of the video
+        is fetched (yt-dlp download_ranges), saving the bandwidth and disk
+        of the rest of the service. Partial files get a range-specific
+        suffix so they never shadow a full download.
+
+        With max_resolution <= 720, a pre-muxed progressive format is
+        requested instead of separate video+audio streams, skipping the
+        ffmpeg merge pass entirely when YouTube still offers one.
 
         Returns:
             tuple: (video_path: str, video_id: str)
         """
         video_id = self.extract_video_id(url)
-        base_opts = self._build_base_opts()
+        suffix = self._range_suffix(ranges) if ranges else ""
 
-        # 1. Quick check: skip if already downloaded
+        # 1. Quick check: skip if already downloaded.
+        # A previously downloaded full video also satisfies a range request
+        # (the caller just cuts it locally).
         if video_id:
-            existing = self._find_existing_video(video_id)
+            existing = self._find_existing_video(video_id) or (
+                self._find_existing_video(video_id, suffix) if ranges else None
+            )
             if existing:
-                res = self._get_video_resolution(existing)
+                res = self._get_video_resolution(existing, video_id)
                 res_label = f" ({res})" if res else ""
                 print(f"Video {video_id} already exists in downloads{res_label}. Skipping download.")
                 return str(existing), video_id
 
-        # 2. Extract metadata (without downloading) to learn the official ID and resolution
-        info = None
-        try:
-            with yt_dlp.YoutubeDL(base_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                if info:
-                    video_id = info.get('id', video_id)
-        except Exception as e:
-            print(f"Warning: Info extraction failed ({e}). Retrying without cookies...")
-            no_cookie_opts = {k: v for k, v in base_opts.items()
-                             if k not in ('cookiefile', 'cookiesfrombrowser')}
+        # 2. Extract metadata (without downloading) to learn the official ID
+        # and resolution. A fresh info.json from an earlier run (e.g. a
+        # probe-then-download pair, or a retry) skips the roundtrip.
+        info = self._load_cached_info(video_id) if video_id else None
+        if info:
+            print(f"Using cached video info for {video_id}.")
+            video_id = info.get('id', video_id)
+            self._cache_resolution_from_info(info)
+        else:
+            base_opts = self._build_base_opts()
             try:
-                with yt_dlp.YoutubeDL(no_cookie_opts) as ydl:
+                with yt_dlp.YoutubeDL(base_opts) as ydl:
                     info = ydl.extract_info(url, download=False)
                     if info:
+                        info = ydl.sanitize_info(info)
                         video_id = info.get('id', video_id)
-            except Exception as e2:
-                print(f"Warning: Could not extract video info without cookies either: {e2}")
+                        self._cache_resolution_from_info(info)
+                        self._save_info_cache(info)
+            except Exception as e:
+                print(f"Warning: Info extraction failed ({e}). Retrying without cookies...")
+                no_cookie_opts = {k: v for k, v in base_opts.items()
+                                 if k not in ('cookiefile', 'cookiesfrombrowser')}
+                try:
+                    with yt_dlp.YoutubeDL(no_cookie_opts) as ydl:
+                        info = ydl.extract_info(url, download=False)
+                        if info:
+                            info = ydl.sanitize_info(info)
+                            video_id = info.get('id', video_id)
+                            self._cache_resolution_from_info(info)
+                            self._save_info_cache(info)
+                except Exception as e2:
+                    print(f"Warning: Could not extract video info without cookies either: {e2}")
 
         if not video_id:
             raise Exception("Could not determine video ID from URL or YouTube API.")
 
         # 3. Check again with the official ID (may differ from regex)
-        existing = self._find_existing_video(video_id)
+        existing = self._find_existing_video(video_id) or (
+            self._find_existing_video(video_id, suffix) if ranges else None
+        )
         if existing:
-            res = self._get_video_resolution(existing)
+            res = self._get_video_resolution(existing, video_id)
             res_label = f" ({res})" if res else ""
             print(f"Video {video_id} already exists in downloads{res_label}. Skipping download.")
             return str(existing), video_id
 
-        # 4. Prepare download options
-        import copy
-        download_opts = copy.deepcopy(base_opts)
-        download_opts.update({
-            'format': 'bestvideo[height<=1080]+bestaudio/best[height<=1080]/best',
-            'outtmpl': str(self.output_dir / '%(id)s.%(ext)s'),
-            'merge_output_format': 'mp4',
+        # 4. Prepare download options. Downloads land in a per-process
+        # temp subdir and are moved into place atomically afterwards, so
+        # an interrupted run never leaves a half-written video where the
+        # skip-existing checks would trust it.
+        tmp_dir = self.output_dir / f".tmp_{os.getpid()}_{video_id}{suffix}"
+        tmp_dir.mkdir(exist_ok=True)
+
+        if max_resolution <= 720:
+            # Progressive formats are already muxed; no ffmpeg merge.
+            format_opts = {
+                'format': (
+                    f'best[height<={max_resolution}][ext=mp4]'
+                    f'/best[height<={max_resolution}]'
+                ),
+            }
+        else:
+            format_opts = {
+                'format': (
+                    f'bestvideo[height<={max_resolution}]+bestaudio'
+                    f'/best[height<={max_resolution}]/best'
+                ),
+                'merge_output_format': 'mp4',
+            }
+
+        # Shallow merge is enough: the base opts' nested dicts are never
+        # mutated, only shadowed by these top-level overrides.
+        download_opts = {
+            **self._build_base_opts(),
+            **format_opts,
+            'outtmpl': str(tmp_dir / f'%(id)s{suffix}.%(ext)s'),
             'quiet': False,
             'no_warnings': False,
             'youtube_include_dash_manifest': True,
             'youtube_include_hls_manifest': True,
-        })
+        }
+
+        if ranges:
+            start, end = ranges
+            print(f"  [✂️] Downloading only {start:.0f}s → {end:.0f}s of the video.")
+            download_opts['download_ranges'] = yt_dlp.utils.download_range_func(None, [(start, end)])
+            download_opts['force_keyframes_at_cuts'] = True
 
         self._clear_ytdlp_cache()
 
@@ -195,65 +506,133 @@ class Downloader:
             print("\n[⚠️] Downloading without metadata (bot detection may be active).")
             print("--- Starting Download ---\n")
 
-        # 6. Download
+        # 6. Download. Reuse the already-extracted info dict when we have
+        # one, so yt-dlp doesn't repeat the metadata roundtrip + player
+        # response parse it just did in step 2.
         try:
             with yt_dlp.YoutubeDL(download_opts) as ydl:
-                ydl.download([url])
+                if info:
+                    ydl.process_ie_result(info, download=True)
+                else:
+                    ydl.download([url])
         except Exception as e:
             print(f"Detailed Error in download_video: {e}")
             raise
+        finally:
+            # Promote finished files atomically; leftover .part/.ytdl
+            # fragments stay quarantined in the temp dir.
+            for entry in list(tmp_dir.iterdir()):
+                if not entry.name.endswith(('.part', '.ytdl')):
+                    os.replace(entry, self.output_dir / entry.name)
+            try:
+                tmp_dir.rmdir()
+            except OSError:
+                pass
 
         # 7. Find the downloaded file
-        video_path = self._find_existing_video(video_id)
+        self._invalidate_index()
+        video_path = self._find_existing_video(video_id, suffix)
         if not video_path:
             raise Exception(
                 f"Download finished but file not found for {video_id} in {self.output_dir}. "
                 "Bot detection likely blocked the download."
             )
 
-        res = self._get_video_resolution(video_path)
+        res = self._get_video_resolution(video_path, video_id)
         if res:
             print(f"  [✓] Downloaded: {video_id} at {res}")
 
         return str(video_path), video_id
 
+    def download_videos(self, urls, max_workers=4):
+        """Downloads several videos concurrently.
+
+        Each download_video call builds its own YoutubeDL and writes to
+        its own temp dir, so a modest thread pool is safe and typically
+        saturates the pipe when YouTube caps per-connection throughput.
+        Kept at 4 workers by default to stay under rate limits.
+        Returns {url: (video_path, video_id) or None on failure}.
+        """
+        if not urls:
+            return {}
+
+        def _one(url):
+            try:
+                return self.download_video(url)
+            except Exception as e:
+                print(f"  [❌] Download failed for {url}: {e}")
+                return None
+
+        workers = min(len(urls), max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_one, urls)
+        return dict(zip(urls, results))
+
     def get_transcript(self, video_id):
         """Fetches the transcript for the given video ID and saves it to a file."""
-        transcript_path = self.output_dir / f"{video_id}.json"
-
         # 1. Return cached transcript if available
-        if transcript_path.exists() and transcript_path.stat().st_size > 0:
+        store = self._get_transcript_store()
+        cached = store.get(video_id)
+        if cached:
+            print(f"Transcript for {video_id} already cached. Loading from store.")
+            return cached
+
+        # Legacy JSON sidecar from before the SQLite store: load it once,
+        # migrate it into the store, and retire the file.
+        transcript_path = self.output_dir / f"{video_id}.json"
+        if self._dir_index().get(transcript_path.name, 0) > 0:
             print(f"Transcript for {video_id} already exists. Loading from file.")
             try:
-                with open(transcript_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, Exception) as e:
+                transcript = _json_loads(transcript_path.read_bytes())
+                store.put(video_id, transcript)
+                transcript_path.unlink(missing_ok=True)
+                self._invalidate_index()
+                return transcript
+            except Exception as e:
                 print(f"Transcript file {transcript_path} is corrupted: {e}. Deleting and refetching.")
                 transcript_path.unlink()
+                self._invalidate_index()
 
-        # 2. Try fetching with Chrome cookies (loaded directly, no yt-dlp call)
-        try:
-            import requests
-            import browser_cookie3
+        # 2. Try fetching with the shared pooled session (Chrome cookies),
+        # retrying transient HTTP failures with exponential backoff + jitter.
+        from requests.exceptions import RequestException
+
+        api = self._get_transcript_api()
 
-            session = requests.Session()
+        for attempt in range(self.TRANSCRIPT_RETRIES):
             try:
-                cj = browser_cookie3.chrome(domain_name='.youtube.com')
-                session.cookies = cj
-                print("  [🍪] Loaded Chrome cookies for transcript fetch.")
+                transcript_obj = api.fetch(video_id, languages=['pt', 'en'])
+                transcript = transcript_obj.to_raw_data()
+
+                self._save_transcript(video_id, transcript)
+                return transcript
+            except RequestException as e:
+                if attempt == self.TRANSCRIPT_RETRIES - 1:
+                    print(f"Transcript fetch failed after {self.TRANSCRIPT_RETRIES} attempts: {type(e).__name__}")
+                    break
+                delay = min(60, 2 ** attempt + random.uniform(0, 1))
+                print(f"  [🔁] Transcript fetch error ({type(e).__name__}). Retrying in {delay:.1f}s...")
+                time.sleep(delay)
             except Exception as e:
-                print(f"  [⚠️] Could not load Chrome cookies: {e}")
+                print(f"Transcript API blocked: {type(e).__name__}")
+                break
 
-            api = YouTubeTranscriptApi(http_client=session)
-            transcript_obj = api.fetch(video_id, languages=['pt', 'en'])
-            transcript = transcript_obj.to_raw_data()
+        print("  [🔄] Falling back to yt-dlp subtitle extraction...")
+        return self._get_transcript_via_ytdlp(video_id)
 
-            self._save_transcript(video_id, transcript)
-            return transcript
-        except Exception as e:
-            print(f"Transcript API blocked: {type(e).__name__}")
-            print("  [🔄] Falling back to yt-dlp subtitle extraction...")
-            return self._get_transcript_via_ytdlp(video_id)
+    def get_transcripts(self, video_ids, max_workers=8):
+        """Fetches transcripts for several videos concurrently.
+
+        Transcript fetches are network-latency-bound, so a thread pool
+        over the shared pooled session overlaps them — useful for
+        playlist/batch ingestion. Returns {video_id: transcript-or-None}.
+        """
+        if not video_ids:
+            return {}
+        workers = min(len(video_ids), max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(self.get_transcript, video_ids)
+        return dict(zip(video_ids, results))
 
     def _get_transcript_via_ytdlp(self, video_id):
         """Fallback: use yt-dlp to download subtitles when the transcript API is IP-blocked."""
@@ -281,62 +660,81 @@ class Downloader:
             print(f"  [❌] yt-dlp subtitle download failed: {e}")
             return None
 
-        # Find the subtitle file (json3 format)
-        transcript = None
-        for lang in ['pt', 'en']:
-            for pattern in [f"{video_id}.{lang}.json3", f"{video_id}.{lang}*.json3"]:
-                matches = glob.glob(str(sub_dir / f"{video_id}*{lang}*json3"))
-                if matches:
-                    transcript = self._parse_json3_subtitles(matches[0])
-                    if transcript:
-                        print(f"  [✓] Loaded subtitles via yt-dlp ({lang})")
-                        self._save_transcript(video_id, transcript)
-                        # Cleanup subtitle files
-                        for f in sub_dir.iterdir():
-                            f.unlink()
-                        sub_dir.rmdir()
-                        return transcript
-
-        # Try VTT format as fallback
-        for lang in ['pt', 'en']:
-            matches = glob.glob(str(sub_dir / f"{video_id}*{lang}*vtt"))
-            if matches:
-                transcript = self._parse_vtt_subtitles(matches[0])
+        # One scandir pass classifies the subtitle files by language and
+        # format; the old glob-per-pattern approach re-listed the
+        # directory up to six times.
+        with os.scandir(sub_dir) as it:
+            files = [e.path for e in it]
+        by_lang = {'pt': {}, 'en': {}}
+        for path in files:
+            name = os.path.basename(path)
+            if video_id not in name:
+                continue
+            for lang in by_lang:
+                if f'.{lang}' in name:
+                    if name.endswith('.json3'):
+                        by_lang[lang]['json3'] = path
+                    elif name.endswith('.vtt'):
+                        by_lang[lang]['vtt'] = path
+                    break
+
+        def _cleanup():
+            for path in files:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            try:
+                sub_dir.rmdir()
+            except OSError:
+                pass
+
+        # json3 is preferred across both languages, then VTT as fallback
+        attempts = (
+            ('json3', self._parse_json3_subtitles, ''),
+            ('vtt', self._parse_vtt_subtitles, ', VTT'),
+        )
+        for fmt, parser, label in attempts:
+            for lang in ('pt', 'en'):
+                path = by_lang[lang].get(fmt)
+                if not path:
+                    continue
+                transcript = parser(path)
                 if transcript:
-                    print(f"  [✓] Loaded subtitles via yt-dlp ({lang}, VTT)")
+                    print(f"  [✓] Loaded subtitles via yt-dlp ({lang}{label})")
                     self._save_transcript(video_id, transcript)
-                    for f in sub_dir.iterdir():
-                        f.unlink()
-                    sub_dir.rmdir()
+                    _cleanup()
                     return transcript
 
         print("  [❌] No subtitle files found via yt-dlp.")
-        # Cleanup
-        for f in sub_dir.iterdir():
-            f.unlink()
-        sub_dir.rmdir()
+        _cleanup()
         return None
 
     @staticmethod
     def _parse_json3_subtitles(filepath):
         """Parses yt-dlp's json3 subtitle format into our transcript format."""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            events = data.get('events', [])
+            data = _json_loads(Path(filepath).read_bytes())
             transcript = []
-            for event in events:
-                if 'segs' not in event:
+            append = transcript.append
+            # Tight loop: transcripts run to thousands of events, so bind
+            # the append method once and fast-path the common single-seg
+            # case instead of building a join generator per event.
+            for event in data.get('events', []):
+                segs = event.get('segs')
+                if not segs:
                     continue
-                text = ''.join(seg.get('utf8', '') for seg in event['segs']).strip()
-                if not text or text == '\n':
+                if len(segs) == 1:
+                    text = segs[0].get('utf8', '')
+                else:
+                    text = ''.join(seg.get('utf8', '') for seg in segs)
+                text = text.strip()
+                if not text:
                     continue
-                start_ms = event.get('tStartMs', 0)
-                duration_ms = event.get('dDurationMs', 0)
-                transcript.append({
+                append({
                     'text': text,
-                    'start': start_ms / 1000.0,
-                    'duration': duration_ms / 1000.0,
+                    'start': event.get('tStartMs', 0) * 0.001,
+                    'duration': event.get('dDurationMs', 0) * 0.001,
                 })
             return transcript if transcript else None
         except Exception as e:
@@ -350,26 +748,21 @@ class Downloader:
             with open(filepath, 'r', encoding='utf-8') as f:
                 content = f.read()
             
+            # Single finditer pass over the whole file instead of
+            # split('\n\n') + per-block line scans, which allocates two
+            # intermediate string lists per cue.
             transcript = []
-            blocks = content.split('\n\n')
-            for block in blocks:
-                lines = block.strip().split('\n')
-                # Find timestamp line (HH:MM:SS.mmm --> HH:MM:SS.mmm)
-                for i, line in enumerate(lines):
-                    if '-->' in line:
-                        times = line.split('-->')
-                        start = Downloader._vtt_time_to_seconds(times[0].strip())
-                        end = Downloader._vtt_time_to_seconds(times[1].strip().split(' ')[0])
-                        text = ' '.join(lines[i+1:]).strip()
-                        # Remove VTT formatting tags
-                        text = re.sub(r'<[^>]+>', '', text)
-                        if text:
-                            transcript.append({
-                                'text': text,
-                                'start': start,
-                                'duration': end - start,
-                            })
-                        break
+            append = transcript.append
+            to_seconds = Downloader._vtt_time_to_seconds
+            for m in _VTT_CUE_RE.finditer(content):
+                text = _VTT_TAG_RE.sub('', m[3]).replace('\n', ' ').strip()
+                if text:
+                    start = to_seconds(m[1])
+                    append({
+                        'text': text,
+                        'start': start,
+                        'duration': to_seconds(m[2]) - start,
+                    })
             return transcript if transcript else None
         except Exception as e:
             print(f"  Error parsing VTT subtitles: {e}")
@@ -377,25 +770,25 @@ class Downloader:
 
     @staticmethod
     def _vtt_time_to_seconds(time_str):
-        """Converts VTT timestamp (HH:MM:SS.mmm) to seconds."""
-        parts = time_str.replace(',', '.').split(':')
-        if len(parts) == 3:
-            return int(parts[0]) * 3600 + int(parts[1]) * 60 + float(parts[2])
-        elif len(parts) == 2:
-            return int(parts[0]) * 60 + float(parts[1])
-        return float(parts[0])
+        """Converts VTT timestamp ([HH:]MM:SS.mmm) to seconds."""
+        m = _VTT_TS_RE.match(time_str)
+        if m:
+            hours = int(m[1]) if m[1] else 0
+            millis = int(m[4].ljust(3, '0')[:3])
+            return hours * 3600 + int(m[2]) * 60 + int(m[3]) + millis / 1000
+        try:
+            return float(time_str.replace(',', '.'))
+        except ValueError:
+            return 0.0
 
     def _save_transcript(self, video_id, data):
-        """Saves transcript data to a local JSON file."""
-        transcript_path = self.output_dir / f"{video_id}.json"
-        try:
-            with open(transcript_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            print(f"Transcript saved to: {transcript_path}")
-        except Exception as e:
-            print(f"Error saving transcript to file: {e}")
-            if transcript_path.exists():
-                transcript_path.unlink()
+        """Persists transcript data to the shared SQLite store.
+
+        SQLite's journal makes the write atomic, so a crash mid-write
+        can never leave a corrupted transcript behind.
+        """
+        self._get_transcript_store().put(video_id, data)
+        print(f"Transcript for {video_id} saved to store.")
 
 
 
@@ -1,6 +1,7 @@
 import os
+import email.utils
 from supabase import create_client, Client
-from src.r2_storage import R2Storage
+from src.r2_storage import get_r2_storage
 
 
 class PodcastManager:
@@ -12,7 +13,7 @@ class PodcastManager:
             raise ValueError("SUPABASE_URL or SUPABASE_KEY missing in .env")
             
         self.supabase: Client = create_client(self.url, self.key)
-        self.r2 = R2Storage()
+        self.r2 = get_r2_storage()
 
     def upload_file(self, file_path, object_name=None, content_type=None):
         """Uploads a file to Cloudflare R2 and returns its public URL."""
@@ -23,6 +24,18 @@ class PodcastManager:
         res = self.supabase.table("episodes").select("*").eq("title", title.strip()).execute()
         return res.data[0] if res.data else None
 
+    def get_episodes_by_titles(self, titles):
+        """Returns {title: episode record} for every title that already exists.
+
+        One in_() query replaces a round-trip per title, which is what
+        dominates a feed sync against a remote database.
+        """
+        titles = [t.strip() for t in titles if t and t.strip()]
+        if not titles:
+            return {}
+        res = self.supabase.table("episodes").select("*").in_("title", titles).execute()
+        return {row["title"]: row for row in (res.data or [])}
+
     def add_episode(self, episode_data):
         """Inserts a new episode into the Supabase database."""
         # Normalize duration for the feed (HH:MM:SS)
@@ -50,8 +63,6 @@ class PodcastManager:
 
     def update_episode_metadata(self, episode_id, metadata):
         """Updates metadata for an existing episode identified by ID."""
-        import email.utils
-
         # Map keys to DB columns
         db_data = {}
         mapping = {
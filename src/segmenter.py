@@ -1,8 +1,44 @@
 import os
 import json
-from openai import OpenAI
+import time
+import bisect
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from src.paths import PROJECT_ROOT
+from src.cache import Cache
+
+# Same optional accelerator as the downloader: orjson parses the model's
+# JSON responses a few times faster, stdlib json works fine without it.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+class _RateLimiter:
+    """Spaces OpenAI requests to a requests-per-minute budget.
+
+    Proactive pacing instead of reacting to 429s: with detect_many
+    fanning out over a thread pool, waiting for the rate-limit error
+    wastes a round-trip plus the server-mandated backoff per hit.
+    Thread-safe; rpm <= 0 disables the gate.
+    """
+
+    def __init__(self, rpm):
+        self.interval = 60.0 / rpm if rpm > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if wait > 0:
+            time.sleep(wait)
 
 
 class Segmenter:
@@ -10,13 +46,26 @@ class Segmenter:
         self.api_key = os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             print("Warning: OPENAI_API_KEY not found in environment. OpenAI detection will fail.")
-        self.client = OpenAI(api_key=self.api_key) if self.api_key else None
+        if self.api_key:
+            # Deferred: the openai package import is slow enough to show
+            # up in CLI startup, and heuristics-only runs never need it.
+            from openai import OpenAI
+            self.client = OpenAI(api_key=self.api_key)
+        else:
+            self.client = None
         self.prompts_dir = Path(prompts_dir) if prompts_dir else PROJECT_ROOT / "prompts"
-        
+
         # Load prompts
         self.detection_prompt_tpl = self._load_prompt("detection_prompt.txt")
         self.metadata_prompt_tpl = self._load_prompt("metadata_prompt.txt")
 
+        # Memoize LLM results on disk. Keys include the prompt template,
+        # so editing a prompt file invalidates its cached entries.
+        self.cache = Cache()
+
+        # Shared request pacing for interactive and batch calls alike.
+        self.limiter = _RateLimiter(int(os.getenv("CHURCHPOD_OPENAI_RPM", 60)))
+
     def _load_prompt(self, filename):
         path = self.prompts_dir / filename
         if path.exists():
@@ -32,24 +81,41 @@ class Segmenter:
         if not transcript:
             return None, None
 
+        # Gate: videos under 15 minutes are effectively always the
+        # sermon end to end, so the LLM call is pure overhead.
+        total_duration = transcript[-1]['start'] + transcript[-1].get('duration', 0)
+        if total_duration < 900 or len(transcript) < 20:
+            print(f"Short video ({total_duration:.0f}s). Using the full range without AI detection.")
+            return 0, total_duration
+
         if not self.client or not self.detection_prompt_tpl:
             print("OpenAI client or prompt template missing. Falling back to heuristics.")
             return self._heuristic_fallback(transcript)
 
-        # Prepare a compact version of the transcript for the LLM
-        compact_transcript = ""
+        cache_key = Cache.make_key("detection", self.detection_prompt_tpl, transcript)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print("Using cached AI detection result.")
+            return cached.get("start"), cached.get("end")
+
+        # Prepare a compact version of the transcript for the LLM.
+        # Collected in a list and joined once; += on a string reallocates
+        # the whole buffer per line on multi-hour transcripts.
+        lines = []
         last_minute = -1
         for entry in transcript:
             minute = int(entry['start'] // 60)
             if minute != last_minute:
-                compact_transcript += f"[{entry['start']:.0f}s] {entry['text']}\n"
+                lines.append(f"[{entry['start']:.0f}s] {entry['text']}")
                 last_minute = minute
             elif len(entry['text']) > 50:
-                compact_transcript += f"[{entry['start']:.0f}s] {entry['text']}\n"
+                lines.append(f"[{entry['start']:.0f}s] {entry['text']}")
+        compact_transcript = "\n".join(lines) + "\n" if lines else ""
 
         prompt = self.detection_prompt_tpl.format(transcript=compact_transcript)
 
         try:
+            self.limiter.acquire()
             response = self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
@@ -59,16 +125,32 @@ class Segmenter:
                 response_format={"type": "json_object"}
             )
             
-            result = json.loads(response.choices[0].message.content)
+            result = _json_loads(response.choices[0].message.content)
             start = result.get("start_seconds")
             end = result.get("end_seconds")
             print(f"OpenAI Detection Reason: {result.get('reason')}")
+            self.cache.put(cache_key, {"start": start, "end": end})
             return start, end
 
         except Exception as e:
             print(f"Error calling OpenAI API for detection: {e}")
             return self._heuristic_fallback(transcript)
 
+    def detect_many(self, transcripts, max_workers=8):
+        """Runs segment detection for several transcripts concurrently.
+
+        For batch re-processing of archives: the OpenAI client is
+        thread-safe and detection is latency-bound, so a thread pool
+        overlaps the calls the same way the downloader batches its
+        transcript fetches. Cached transcripts short-circuit without a
+        request. Returns a list of (start, end) tuples, input order.
+        """
+        if not transcripts:
+            return []
+        workers = min(len(transcripts), max_workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.detect_preaching_segment, transcripts))
+
     def generate_metadata(self, transcript, start_time, end_time):
         """
         Uses OpenAI to generate Title, Description and Tags based on the preaching segment.
@@ -76,13 +158,28 @@ class Segmenter:
         if not self.client or not self.metadata_prompt_tpl:
             return None
 
-        # Extract only the relevant part of the transcript
-        relevant_text = ""
-        for entry in transcript:
-            if start_time <= entry['start'] <= end_time:
-                relevant_text += entry['text'] + " "
-                if len(relevant_text) > 4000:  # Limit context for metadata
-                    break
+        cache_key = Cache.make_key(
+            "metadata", self.metadata_prompt_tpl, start_time, end_time, transcript
+        )
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print("Using cached AI metadata result.")
+            return cached
+
+        # Extract only the relevant part of the transcript. Entry starts
+        # are monotonic, so bisect finds the window without scanning the
+        # whole transcript; a running character count caps the context.
+        starts = [entry['start'] for entry in transcript]
+        lo = bisect.bisect_left(starts, start_time)
+        hi = bisect.bisect_right(starts, end_time)
+        parts = []
+        total_chars = 0
+        for entry in transcript[lo:hi]:
+            parts.append(entry['text'])
+            total_chars += len(entry['text']) + 1
+            if total_chars > 4000:  # Limit context for metadata
+                break
+        relevant_text = " ".join(parts) + " " if parts else ""
 
         prompt = self.metadata_prompt_tpl.format(
             start_time=start_time, 
@@ -91,6 +188,7 @@ class Segmenter:
         )
 
         try:
+            self.limiter.acquire()
             response = self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
@@ -100,7 +198,9 @@ class Segmenter:
                 response_format={"type": "json_object"}
             )
             
-            return json.loads(response.choices[0].message.content)
+            metadata = _json_loads(response.choices[0].message.content)
+            self.cache.put(cache_key, metadata)
+            return metadata
 
         except Exception as e:
             print(f"Error calling OpenAI API for metadata: {e}")
@@ -1,17 +1,19 @@
 import os
-import google.oauth2.credentials
-import google_auth_oauthlib.flow
+import time
+import random
+import socket
 from src.paths import PROJECT_ROOT
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-import pickle
+
+# The Google API SDKs are imported lazily inside the class: they cost
+# hundreds of ms at import time, and pipeline runs with --no-upload
+# never touch YouTube.
 
 # The CLIENT_SECRETS_FILE variable specifies the name of a file that contains
 # the OAuth 2.0 information for this application, including its client_id and
 # client_secret.
 CLIENT_SECRETS_FILE = PROJECT_ROOT / "credentials" / "client_secrets.json"
+TOKEN_FILE = PROJECT_ROOT / "credentials" / "token.json"
+# Pre-JSON token store; migrated on first use, then deleted.
 TOKEN_PICKLE_FILE = PROJECT_ROOT / "credentials" / "token.pickle"
 
 # This OAuth 2.0 access scope allows for full read/write access to the
@@ -20,19 +22,34 @@ SCOPES = ['https://www.googleapis.com/auth/youtube.upload']
 API_SERVICE_NAME = 'youtube'
 API_VERSION = 'v3'
 
+# 8 MB resumable-upload chunks: large enough to amortize per-request
+# latency on big cut videos, small enough for useful progress output.
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
 class Uploader:
     def __init__(self):
+        from googleapiclient.discovery import build
+
         self.credentials = self._get_credentials()
         self.youtube = build(API_SERVICE_NAME, API_VERSION, credentials=self.credentials)
 
     def _get_credentials(self):
+        from google.oauth2.credentials import Credentials
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        from google.auth.transport.requests import Request
+
         creds = None
-        # The file token.pickle stores the user's access and refresh tokens, and is
-        # created when the authorization flow completes for the first time.
-        if os.path.exists(TOKEN_PICKLE_FILE):
+        # token.json stores the user's access and refresh tokens in the
+        # official authorized-user format; it is created when the
+        # authorization flow completes for the first time.
+        if os.path.exists(TOKEN_FILE):
+            creds = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
+        elif os.path.exists(TOKEN_PICKLE_FILE):
+            # One-time migration from the old pickle store.
+            import pickle
             with open(TOKEN_PICKLE_FILE, 'rb') as token:
                 creds = pickle.load(token)
-        
+
         # If there are no (valid) credentials available, let the user log in.
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
@@ -40,18 +57,23 @@ class Uploader:
             else:
                 if not os.path.exists(CLIENT_SECRETS_FILE):
                     raise FileNotFoundError(f"Please provide '{CLIENT_SECRETS_FILE}' to authenticate with YouTube API.")
-                
+
                 flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRETS_FILE, SCOPES)
                 creds = flow.run_local_server(port=0)
-            
-            # Save the credentials for the next run
-            with open(TOKEN_PICKLE_FILE, 'wb') as token:
-                pickle.dump(creds, token)
-        
+
+        # Save (or migrate) the credentials for the next run
+        with open(TOKEN_FILE, 'w', encoding='utf-8') as token:
+            token.write(creds.to_json())
+        if os.path.exists(TOKEN_PICKLE_FILE):
+            os.unlink(TOKEN_PICKLE_FILE)
+
         return creds
 
     def upload_video(self, file_path, title, description, tags=None, category_id="22", privacy_status="unlisted"):
         """Uploads a video to YouTube as unlisted by default."""
+        from googleapiclient.errors import HttpError
+        from googleapiclient.http import MediaFileUpload
+
         body = {
             'snippet': {
                 'title': title,
@@ -68,14 +90,35 @@ class Uploader:
         insert_request = self.youtube.videos().insert(
             part=','.join(body.keys()),
             body=body,
-            media_body=MediaFileUpload(file_path, chunksize=-1, resumable=True)
+            media_body=MediaFileUpload(file_path, chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
         )
 
         res = None
+        last_progress = -1
+        consecutive_errors = 0
         while res is None:
-            status, res = insert_request.next_chunk()
+            try:
+                # num_retries lets the client retry transient 5xx/connection
+                # errors per chunk instead of failing the whole upload.
+                status, res = insert_request.next_chunk(num_retries=3)
+                consecutive_errors = 0
+            except (HttpError, socket.timeout, OSError) as e:
+                # The session is resumable, so back off and continue from
+                # the last acknowledged chunk instead of restarting a
+                # multi-GB upload. Non-retriable HTTP statuses re-raise.
+                retriable = not isinstance(e, HttpError) or e.resp.status in (500, 502, 503, 504)
+                consecutive_errors += 1
+                if not retriable or consecutive_errors > 5:
+                    raise
+                delay = 2 ** consecutive_errors + random.uniform(0, 1)
+                print(f"Retriable upload error ({type(e).__name__}). Retrying in {delay:.1f}s...")
+                time.sleep(delay)
+                continue
             if status:
-                print(f"Uploaded {int(status.progress() * 100)}%")
+                progress = int(status.progress() * 100)
+                if progress != last_progress:
+                    print(f"Uploaded {progress}%")
+                    last_progress = progress
         
         print(f"Video uploaded successfully! Video ID: {res.get('id')}")
         return res.get('id')
@@ -86,6 +129,8 @@ class Uploader:
             print(f"Thumbnail file not found: {thumb_path}")
             return False
 
+        from googleapiclient.http import MediaFileUpload
+
         try:
             self.youtube.thumbnails().set(
                 videoId=video_id,